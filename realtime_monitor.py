@@ -6,20 +6,101 @@
 """
 
 import os
+import json
 import time
+import threading
 import subprocess
-from datetime import datetime
+from bisect import bisect_right
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
-from binance import Client
+from binance import Client, ThreadedWebsocketManager
+from binance.exceptions import BinanceAPIException, BinanceRequestException
 from rich.console import Console, Group
 from rich.table import Table
 from rich.live import Live
 from rich.panel import Panel
 from rich.text import Text
+from rich.style import Style
 from rich.layout import Layout
 from dotenv import load_dotenv
 
+# pyobjc 为可选依赖，未安装时通过 osascript 发送通知
+try:
+    from Foundation import NSUserNotification, NSUserNotificationCenter
+except ImportError:
+    NSUserNotification = None
+    NSUserNotificationCenter = None
+
+# orjson 为可选依赖，安装后REST响应用它解析（python-binance的WebSocket推送也会自动使用）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 通知投递线程，单线程保证通知按顺序送达
+_notification_executor = ThreadPoolExecutor(max_workers=1)
+
+# 表格单元格样式，预先创建以免每帧解析markup
+_STYLE_GREEN = Style(color="green")
+_STYLE_RED = Style(color="red")
+_STYLE_WHITE = Style(color="white")
+_STYLE_DIM = Style(dim=True)
+_STYLE_BOLD = Style(bold=True)
+
+# 价格显示格式：按价格区间选择精度，<1 / 1~1000 / >=1000
+_PRICE_THRESHOLDS = (1, 1000)
+_PRICE_FORMATTERS = ("{:.8f}".format, "{:.4f}".format, "{:,.2f}".format)
+
+# 涨跌/收益的格式和颜色，按符号 (x > 0) - (x < 0) 取下标：0持平 / 1上涨 / -1下跌
+_SIGN_STYLES = (_STYLE_WHITE, _STYLE_GREEN, _STYLE_RED)
+_CHANGE_FORMATTERS = ("{:.2f}%".format, "+{:.2f}%".format, "{:.2f}%".format)
+_PROFIT_FORMATTERS = (
+    "{:.2f}U ({:+.2f}%)".format,
+    "+{:.2f}U ({:+.2f}%)".format,
+    "{:.2f}U ({:+.2f}%)".format,
+)
+
+# 界面刷新间隔（秒），与数据的获取节奏无关
+RENDER_INTERVAL = 0.5
+
+# 涨跌幅K线周期：(数据字段, 接口周期, 周期秒数)
+KLINE_INTERVALS = (
+    ('change_1m', Client.KLINE_INTERVAL_1MINUTE, 60),
+    ('change_5m', Client.KLINE_INTERVAL_5MINUTE, 300),
+)
+
+# 推送错误中表示连接已无法恢复的类型：python-binance重连次数用尽、消息队列溢出，或读取循环已退出
+_STREAM_FATAL_ERRORS = frozenset({'BinanceWebsocketUnableToConnect', 'BinanceWebsocketQueueOverflow', 'ReadLoopClosed'})
+
+# REST轮询模式下现货/合约的更新间隔（秒）
+SPOT_POLL_INTERVAL = 1.0
+FUTURES_POLL_INTERVAL = 2.0
+
+# REST并发请求数（不超过requests默认连接池大小10，所有请求都能复用长连接）
+REST_WORKERS = 8
+
+# 现货监控列表：(币种, 显示名称)，新增币种只需在这里加一行
+SPOT_SYMBOLS = [
+    ("BTC", "比特币"),
+    ("ETH", "以太坊"),
+    ("BNB", "币安币"),
+    ("SOL", "索拉纳"),
+    ("TON", "TON"),
+    ("DOGE", "狗狗币"),
+    ("SUI", "SUI"),
+    ("ASTER", "ASTER"),
+]
+
+# 合约监控列表：(币种, 显示名称)
+FUTURES_SYMBOLS = [
+    ("BTC", "比特币合约"),
+    ("ETH", "以太坊合约"),
+    ("BNB", "币安币合约"),
+    ("SOL", "索拉纳合约"),
+]
+
 @dataclass
 class CryptoConfig:
     """加密货币配置类"""
@@ -53,12 +134,14 @@ class FuturesConfig:
         if not self.usdt_pair:
             self.usdt_pair = f"{self.symbol}USDT"
 
-def get_trend_arrow(current_price: float, last_price: float) -> Tuple[str, str]:
-    """获取趋势箭头和描述"""
-    if last_price == 0:
-        return "➡️", "持平"
-    
-    percent = ((current_price - last_price) / last_price) * 100
+def calculate_change_percent(current_price: float, old_price: float) -> float:
+    """计算价格变化百分比"""
+    if old_price == 0:
+        return 0
+    return (current_price - old_price) / old_price * 100
+
+def get_trend_arrow(percent: float) -> Tuple[str, str]:
+    """根据价格变化百分比获取趋势箭头和描述"""
     if percent > 1:
         return "⬆️⬆️", f"强势上涨 (+{percent:.2f}%)"
     elif percent > 0:
@@ -70,9 +153,20 @@ def get_trend_arrow(current_price: float, last_price: float) -> Tuple[str, str]:
     else:
         return "➡️", "持平"
 
-def send_notification(title: str, message: str, subtitle: str = ""):
-    """发送 macOS 通知"""
+def _deliver_notification(title: str, message: str, subtitle: str) -> None:
+    """投递 macOS 通知，优先在进程内调用通知中心，不可用时回退到 osascript"""
     try:
+        if NSUserNotificationCenter is not None:
+            center = NSUserNotificationCenter.defaultUserNotificationCenter()
+            if center is not None:
+                notification = NSUserNotification.alloc().init()
+                notification.setTitle_(title)
+                notification.setSubtitle_(subtitle)
+                notification.setInformativeText_(message)
+                notification.setSoundName_("Glass")
+                center.deliverNotification_(notification)
+                return
+        
         # 使用带子标题的通知
         apple_script = f'''
         display notification "{message}" with title "{title}" subtitle "{subtitle}" sound name "Glass"
@@ -81,6 +175,41 @@ def send_notification(title: str, message: str, subtitle: str = ""):
     except Exception:
         pass
 
+def send_notification(title: str, message: str, subtitle: str = ""):
+    """发送 macOS 通知（在后台线程投递，不阻塞行情更新）"""
+    _notification_executor.submit(_deliver_notification, title, message, subtitle)
+
+class MonitorClient(Client):
+    """币安REST客户端，安装了orjson时直接从响应字节解析JSON"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 直接请求公开接口时沿用 Client 的超时和代理设置
+        self.public_request_params = {'timeout': self.REQUEST_TIMEOUT, **(self._requests_params or {})}
+
+    def get_public(self, url: str):
+        """GET 已拼好完整URL的公开行情接口，跳过 Client 通用的参数拼装和签名流程"""
+        # Client._request 先把响应存到共享的 self.response 再解析，多线程同时调用会拿到别的请求的结果；
+        # 这里直接解析本次响应，可在线程池中并发调用
+        return self._handle_response(self.session.get(url, **self.public_request_params))
+
+    @staticmethod
+    def _handle_response(response):
+        """解析REST响应，错误处理与 Client._handle_response 一致"""
+        if orjson is None:
+            return Client._handle_response(response)
+        
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        
+        if not response.content:
+            return {}
+        
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException("Invalid Response: %s" % response.text)
+
 class PriceMonitor:
     """价格监控类"""
     
@@ -93,118 +222,138 @@ class PriceMonitor:
             'http': os.getenv('HTTP_PROXY', ''),
             'https': os.getenv('HTTPS_PROXY', '')
         }
+        self.https_proxy = proxies['https'] or proxies['http'] or None
+        
+        # 是否使用WebSocket实时推送（设置 USE_WEBSOCKET=false 可回退到REST轮询）
+        self.use_websocket = os.getenv('USE_WEBSOCKET', 'true').strip().lower() not in ('0', 'false', 'no', 'off')
+        self.twm = None
+        
+        # 数据由推送/轮询线程写入、界面线程读取，读写都需要持有该锁
+        self.lock = threading.Lock()
+        # 数据版本号，每次写入行情后递增，界面据此判断是否需要重绘
+        self.data_version = 0
+        self.poll_thread = None
+        self.stop_event = threading.Event()
         
         # 配置现货交易对信息
+        env = os.environ
         self.CRYPTO_PAIRS = [
             CryptoConfig(
-                "BTC", "比特币", "BTCUSDT",
-                float(os.getenv('BTC_PRICE', 0)),
-                float(os.getenv('BTC_AMOUNT', 0)),
-                float(os.getenv('BTC_ALERT_HIGH', 0)),
-                float(os.getenv('BTC_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "ETH", "以太坊", "ETHUSDT",
-                float(os.getenv('ETH_PRICE', 0)),
-                float(os.getenv('ETH_AMOUNT', 0)),
-                float(os.getenv('ETH_ALERT_HIGH', 0)),
-                float(os.getenv('ETH_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "BNB", "币安币", "BNBUSDT",
-                float(os.getenv('BNB_PRICE', 0)),
-                float(os.getenv('BNB_AMOUNT', 0)),
-                float(os.getenv('BNB_ALERT_HIGH', 0)),
-                float(os.getenv('BNB_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "SOL", "索拉纳", "SOLUSDT",
-                float(os.getenv('SOL_PRICE', 0)),
-                float(os.getenv('SOL_AMOUNT', 0)),
-                float(os.getenv('SOL_ALERT_HIGH', 0)),
-                float(os.getenv('SOL_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "TON", "TON", "TONUSDT",
-                float(os.getenv('TON_PRICE', 0)),
-                float(os.getenv('TON_AMOUNT', 0)),
-                float(os.getenv('TON_ALERT_HIGH', 0)),
-                float(os.getenv('TON_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "DOGE", "狗狗币", "DOGEUSDT",
-                float(os.getenv('DOGE_PRICE', 0)),
-                float(os.getenv('DOGE_AMOUNT', 0)),
-                float(os.getenv('DOGE_ALERT_HIGH', 0)),
-                float(os.getenv('DOGE_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "SUI", "SUI", "SUIUSDT",
-                float(os.getenv('SUI_PRICE', 0)),
-                float(os.getenv('SUI_AMOUNT', 0)),
-                float(os.getenv('SUI_ALERT_HIGH', 0)),
-                float(os.getenv('SUI_ALERT_LOW', 0))
-            ),
-            CryptoConfig(
-                "ASTER", "ASTER", "ASTERUSDT",
-                float(os.getenv('ASTER_PRICE', 0)),
-                float(os.getenv('ASTER_AMOUNT', 0)),
-                float(os.getenv('ASTER_ALERT_HIGH', 0)),
-                float(os.getenv('ASTER_ALERT_LOW', 0))
-            ),
+                symbol, display_name, f"{symbol}USDT",
+                float(env.get(f'{symbol}_PRICE', 0)),
+                float(env.get(f'{symbol}_AMOUNT', 0)),
+                float(env.get(f'{symbol}_ALERT_HIGH', 0)),
+                float(env.get(f'{symbol}_ALERT_LOW', 0))
+            )
+            for symbol, display_name in SPOT_SYMBOLS
         ]
         
         # 配置合约交易对信息
         self.FUTURES_PAIRS = [
             FuturesConfig(
-                "BTC", "比特币合约", "BTCUSDT",
-                float(os.getenv('FUTURES_BTC_PRICE', 0)),
-                float(os.getenv('FUTURES_BTC_AMOUNT', 0)),
-                int(os.getenv('FUTURES_BTC_LEVERAGE', 1)),
-                os.getenv('FUTURES_BTC_SIDE', 'LONG')
-            ),
-            FuturesConfig(
-                "ETH", "以太坊合约", "ETHUSDT",
-                float(os.getenv('FUTURES_ETH_PRICE', 0)),
-                float(os.getenv('FUTURES_ETH_AMOUNT', 0)),
-                int(os.getenv('FUTURES_ETH_LEVERAGE', 1)),
-                os.getenv('FUTURES_ETH_SIDE', 'LONG')
-            ),
-            FuturesConfig(
-                "BNB", "币安币合约", "BNBUSDT",
-                float(os.getenv('FUTURES_BNB_PRICE', 0)),
-                float(os.getenv('FUTURES_BNB_AMOUNT', 0)),
-                int(os.getenv('FUTURES_BNB_LEVERAGE', 1)),
-                os.getenv('FUTURES_BNB_SIDE', 'LONG')
-            ),
-            FuturesConfig(
-                "SOL", "索拉纳合约", "SOLUSDT",
-                float(os.getenv('FUTURES_SOL_PRICE', 0)),
-                float(os.getenv('FUTURES_SOL_AMOUNT', 0)),
-                int(os.getenv('FUTURES_SOL_LEVERAGE', 1)),
-                os.getenv('FUTURES_SOL_SIDE', 'LONG')
-            ),
+                symbol, display_name, f"{symbol}USDT",
+                float(env.get(f'FUTURES_{symbol}_PRICE', 0)),
+                float(env.get(f'FUTURES_{symbol}_AMOUNT', 0)),
+                int(env.get(f'FUTURES_{symbol}_LEVERAGE', 1)),
+                env.get(f'FUTURES_{symbol}_SIDE', 'LONG')
+            )
+            for symbol, display_name in FUTURES_SYMBOLS
         ]
         
         self.console = Console()
         # 初始化Client，如果设置了代理则使用代理
         if proxies['http'] or proxies['https']:
-            self.client = Client(
+            self.client = MonitorClient(
                 requests_params={'proxies': proxies, 'timeout': 10}
             )
         else:
-            self.client = Client()
+            self.client = MonitorClient()
+        
+        # REST请求线程池，用于并发拉取K线
+        self.executor = ThreadPoolExecutor(max_workers=REST_WORKERS)
         
         self.price_data = {}
         self.futures_data = {}
         self.last_update_time = ''
         self.last_futures_update_time = ''
+        # 时间戳缓存：(百分之一秒序号, 格式化结果)，以及 (秒序号, "HH:MM:SS." 前缀)
+        self.timestamp_cache = (-1, '')
+        self.timestamp_prefix_cache = (-1, '')
+        # 当前K线开盘价缓存：(交易对, 字段) -> (开盘时间毫秒（服务器时间）, 开盘价)
+        self.kline_open_cache: Dict[Tuple[str, str], Tuple[int, float]] = {}
         self.initialize_price_data()
         self.initialize_futures_data()
         
+        # 有持仓的交易对，收益计算只针对这些交易对进行
+        self.held_spot = [symbol for symbol, data in self.price_data.items() if data['coin_amount'] != 0]
+        self.held_futures = [symbol for symbol, data in self.futures_data.items() if data['buy_amount'] != 0]
+        self.held_futures_set = frozenset(self.held_futures)
+        self.warm_up_connections()
+        self.sync_server_time()
+        
+        # 实际请求行情的现货交易对，不存在（已下架或拼写错误）的交易对会在首次请求时被剔除
+        self.active_spot = list(self.price_data)
+        # 现货公开行情接口的完整URL只拼一次
+        self.spot_ticker_url = self.build_spot_ticker_url()
+        self.klines_urls = {
+            (symbol, key): f"{self.client.API_URL}/v3/klines?symbol={symbol}&interval={interval}&limit=1"
+            for symbol in self.price_data
+            for key, interval, _ in KLINE_INTERVALS
+        }
+        
         # 计算总投资
         self.total_investment = sum(crypto.buy_amount for crypto in self.CRYPTO_PAIRS)
         self.total_futures_investment = sum(futures.buy_amount for futures in self.FUTURES_PAIRS)
+        self.total_profit = 0
+        self.total_profit_percent = 0
+        self.total_futures_profit = 0
+        self.total_futures_profit_percent = 0
+        
+        # 上一帧的排序结果（直接保存行数据的引用，排序和绘制时不再按交易对查表），价格顺序未变化时直接复用
+        self.spot_order = list(self.price_data.values())
+        self.futures_order = [self.futures_data[symbol] for symbol in self.held_futures]
+        
+        # 表格骨架只构建一次，刷新时原地更新
+        self.spot_panel = self.build_spot_panel()
+        self.futures_panel = self.build_futures_panel()
+        self.combined_display = Group(self.spot_panel, self.futures_panel)
+
+    def warm_up_connections(self) -> None:
+        """预先建立REST长连接，让DNS解析和TLS握手在首次取数前完成"""
+        # 并发ping，把现货连接池填满，首次并发拉取K线时每个线程都有现成的连接；
+        # 预热失败不影响启动（Client 创建时已ping过一次），首次取数时照常建立连接
+        ping_url = f"{self.client.API_URL}/v3/ping"
+        try:
+            list(self.executor.map(lambda _: self.client.get_public(ping_url), range(REST_WORKERS)))
+        except Exception:
+            pass
+        
+        # 有合约持仓时合约接口走另一个域名，同样提前握手
+        if self.held_futures:
+            try:
+                self.client.futures_ping()
+            except Exception:
+                pass
+
+    def sync_server_time(self) -> None:
+        """记录服务器时钟与本地时钟的偏差，用于判断当前K线何时结束"""
+        try:
+            sent_ms = time.time() * 1000
+            server_ms = self.client.get_public(f"{self.client.API_URL}/v3/time")['serverTime']
+            # 以请求往返的中点作为服务器时间对应的本地时刻
+            self.client.timestamp_offset = server_ms - (sent_ms + time.time() * 1000) / 2
+        except Exception:
+            # 获取失败时按本地时钟计算，K线开盘价仍以接口返回的数据为准
+            pass
+
+    def server_time_ms(self) -> float:
+        """按服务器时钟估算的当前时间（毫秒）"""
+        return time.time() * 1000 + self.client.timestamp_offset
+
+    def build_spot_ticker_url(self) -> str:
+        """拼接现货24h行情的请求URL，symbols 参数为紧凑的JSON数组"""
+        symbols_param = quote(json.dumps(self.active_spot, separators=(',', ':')))
+        return f"{self.client.API_URL}/v3/ticker/24hr?symbols={symbols_param}"
 
     def initialize_price_data(self):
         """初始化价格数据结构"""
@@ -216,8 +365,12 @@ class PriceMonitor:
                 'change_5m': 0,
                 'change_1m': 0,
                 'display_name': crypto.display_name,
+                # 表格中的币种列文本固定不变，预先拼好
+                'label': f"{crypto.display_name} ({crypto.usdt_pair[:-4]})",
                 'buy_price': crypto.buy_price,
                 'buy_amount': crypto.buy_amount,
+                # 持仓币数量在配置加载后不再变化，预先算好
+                'coin_amount': crypto.buy_amount / crypto.buy_price if crypto.buy_price > 0 else 0,
                 'profit_usdt': 0,
                 'profit_percent': 0,
                 'alert_high': crypto.alert_high,
@@ -234,13 +387,19 @@ class PriceMonitor:
                 'change_24h': 0,
                 'funding_rate': 0,  # 资金费率
                 'display_name': futures.display_name,
+                'label': futures.usdt_pair[:-4],
                 'buy_price': futures.buy_price,
                 'buy_amount': futures.buy_amount,
                 'leverage': futures.leverage,
                 'position_side': futures.position_side,
+                # 收益率系数 = 方向(做多+1/做空-1) × 杠杆，配置加载后不再变化
+                'profit_factor': (-1 if futures.position_side == "SHORT" else 1) * futures.leverage,
                 'profit_usdt': 0,
                 'profit_percent': 0,
-                'liquidation_price': 0  # 爆仓价格
+                # 爆仓价格只取决于开仓价格、杠杆和方向，预先算好
+                'liquidation_price': self.calculate_liquidation_price(
+                    futures.buy_price, futures.leverage, futures.position_side
+                )
             }
 
     def check_price_alerts(self, symbol: str, current_price: float) -> None:
@@ -248,16 +407,19 @@ class PriceMonitor:
         data = self.price_data[symbol]
         alert_high = data['alert_high']
         alert_low = data['alert_low']
+        
+        # 未配置提醒的币种无需任何计算
+        if alert_high <= 0 and alert_low <= 0:
+            return
+        
         last_alert_price = data['last_alert_price']
         last_price = data['last_price']
         display_name = data['display_name']
-
-        # 获取趋势箭头和描述
-        trend_arrow, trend_desc = get_trend_arrow(current_price, last_price)
         
-        # 构建通知标题和消息
+        # 构建通知标题和消息（仅在触发提醒时计算趋势）
         def build_alert_message(price_type: str, threshold: float) -> tuple:
-            change_percent = ((current_price - last_price) / last_price * 100) if last_price > 0 else 0
+            change_percent = calculate_change_percent(current_price, last_price)
+            trend_arrow, trend_desc = get_trend_arrow(change_percent)
             title = f"{display_name} {trend_arrow} {price_type}"
             subtitle = trend_desc
             message = (
@@ -281,218 +443,447 @@ class PriceMonitor:
         # 更新上次价格
         data['last_price'] = current_price
 
-    def calculate_change_percent(self, current_price: float, old_price: float) -> float:
-        """计算价格变化百分比"""
-        if old_price == 0:
-            return 0
-        return ((current_price - old_price) / old_price) * 100
-
     def calculate_profit(self, symbol: str, current_price: float) -> tuple:
         """计算现货收益"""
         data = self.price_data[symbol]
-        buy_price = data['buy_price']
-        buy_amount = data['buy_amount']
+        coin_amount = data['coin_amount']
         
-        if buy_price == 0 or buy_amount == 0:
+        if coin_amount == 0:
             return 0, 0
-            
-        # 计算买入时的币数量
-        coin_amount = buy_amount / buy_price
         
-        # 计算当前市值
-        current_value = coin_amount * current_price
+        buy_amount = data['buy_amount']
         
-        # 计算收益（USDT）
-        profit_usdt = current_value - buy_amount
+        # 计算收益（USDT）= 当前市值 - 投资金额
+        profit_usdt = coin_amount * current_price - buy_amount
         
         # 计算收益率
         profit_percent = (profit_usdt / buy_amount) * 100 if buy_amount > 0 else 0
         
         return profit_usdt, profit_percent
     
+    @staticmethod
+    def calculate_liquidation_price(buy_price: float, leverage: int, position_side: str) -> float:
+        """计算爆仓价格"""
+        if buy_price == 0 or leverage <= 0:
+            return 0
+        
+        if position_side == "LONG":
+            # 做多爆仓价格 = 开仓价格 * (1 - 1/杠杆)
+            return buy_price * (1 - 0.9 / leverage)
+        # 做空爆仓价格 = 开仓价格 * (1 + 1/杠杆)
+        return buy_price * (1 + 0.9 / leverage)
+    
     def calculate_futures_profit(self, symbol: str, current_price: float) -> tuple:
         """计算合约收益"""
         data = self.futures_data[symbol]
         buy_price = data['buy_price']
         buy_amount = data['buy_amount']
-        leverage = data['leverage']
-        position_side = data['position_side']
         
         if buy_price == 0 or buy_amount == 0:
-            return 0, 0, 0
+            return 0, 0
         
-        # 计算价格变化百分比
-        price_change_percent = ((current_price - buy_price) / buy_price) * 100
+        # 收益率 = 价格变化百分比 × 方向 × 杠杆
+        profit_percent = (current_price - buy_price) / buy_price * 100 * data['profit_factor']
+        profit_usdt = buy_amount * profit_percent / 100
         
-        # 根据持仓方向计算收益
-        if position_side == "SHORT":
-            price_change_percent = -price_change_percent
+        return profit_usdt, profit_percent
+
+    def request_klines(self) -> Dict:
+        """提交开盘价已过期的K线请求，同一根K线只请求一次，立即返回未完成的请求"""
+        server_now = self.server_time_ms()
+        pending = {}
+        for symbol in self.active_spot:
+            for key, _, seconds in KLINE_INTERVALS:
+                # 当前K线的开盘价在整个周期内不变，缓存的K线按服务器时间尚未结束时无需请求
+                cached = self.kline_open_cache.get((symbol, key))
+                if cached is not None and server_now < cached[0] + seconds * 1000:
+                    continue
+                # 线程池中并发请求，只能走 get_public，不能用 Client 的 get_klines 等方法
+                pending[(symbol, key)] = self.executor.submit(
+                    self.client.get_public, self.klines_urls[(symbol, key)]
+                )
+        return pending
+
+    def apply_klines_change(self, pending: Dict) -> None:
+        """等待K线请求完成，用缓存的开盘价和最新价计算涨跌幅"""
+        for cache_key, task in pending.items():
+            try:
+                klines = task.result()
+            except Exception:
+                continue
+            if klines:
+                self.kline_open_cache[cache_key] = (int(klines[0][0]), float(klines[0][1]))
         
-        # 计算收益（带杠杆）
-        profit_percent = price_change_percent * leverage
-        profit_usdt = buy_amount * profit_percent / 100
+        server_now = self.server_time_ms()
+        with self.lock:
+            for symbol in self.active_spot:
+                data = self.price_data[symbol]
+                if data['price'] <= 0:
+                    continue
+                for key, _, seconds in KLINE_INTERVALS:
+                    # 请求失败或交界处仍返回上一根K线时缓存已过期，涨跌幅保持不变，不用上一根K线的开盘价计算
+                    cached = self.kline_open_cache.get((symbol, key))
+                    if cached is not None and server_now < cached[0] + seconds * 1000:
+                        data[key] = calculate_change_percent(data['price'], cached[1])
+            self.data_version += 1
+
+    def format_timestamp(self, ns: int) -> str:
+        """格式化显示用的时间戳（HH:MM:SS.ff），同一百分之一秒内直接复用"""
+        bucket = ns // 10_000_000
+        cached_bucket, cached_text = self.timestamp_cache
+        if bucket == cached_bucket:
+            return cached_text
         
-        # 计算爆仓价格
-        if position_side == "LONG":
-            # 做多爆仓价格 = 开仓价格 * (1 - 1/杠杆)
-            liquidation_price = buy_price * (1 - 0.9 / leverage)
-        else:
-            # 做空爆仓价格 = 开仓价格 * (1 + 1/杠杆)
-            liquidation_price = buy_price * (1 + 0.9 / leverage)
+        # 同一秒内只换百分之一秒部分，时分秒前缀每秒只算一次
+        second = bucket // 100
+        cached_second, prefix = self.timestamp_prefix_cache
+        if second != cached_second:
+            t = time.localtime(second)
+            prefix = f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}."
+            self.timestamp_prefix_cache = (second, prefix)
         
-        return profit_usdt, profit_percent, liquidation_price
+        text = f"{prefix}{bucket % 100:02d}"
+        self.timestamp_cache = (bucket, text)
+        return text
 
-    def get_klines_change(self, symbol: str) -> None:
-        """获取K线数据并计算涨跌幅"""
-        try:
-            # 1分钟K线
-            klines_1m = self.client.get_klines(
-                symbol=symbol,
-                interval=Client.KLINE_INTERVAL_1MINUTE,
-                limit=2
-            )
-            if klines_1m:
-                open_price_1m = float(klines_1m[0][1])
-                current_price_1m = float(klines_1m[-1][4])
-                self.price_data[symbol]['change_1m'] = self.calculate_change_percent(
-                    current_price_1m, open_price_1m
-                )
+    def apply_spot_ticker(self, symbol: str, current_price: float, change_24h: float) -> None:
+        """写入单个现货交易对的最新行情"""
+        # 检查价格提醒
+        self.check_price_alerts(symbol, current_price)
+        
+        # 计算收益
+        data = self.price_data[symbol]
+        data['profit_usdt'], data['profit_percent'] = self.calculate_profit(symbol, current_price)
+        data['price'] = current_price
+        data['change_24h'] = change_24h
+        self.data_version += 1
+    
+    def update_spot_totals(self) -> None:
+        """汇总现货总收益"""
+        total_profit = sum(self.price_data[symbol]['profit_usdt'] for symbol in self.held_spot)
+        self.total_profit = total_profit
+        self.total_profit_percent = (total_profit / self.total_investment * 100) if self.total_investment > 0 else 0
+    
+    def apply_futures_ticker(self, symbol: str, current_price: float, change_24h: float) -> None:
+        """写入单个合约交易对的最新行情"""
+        # 计算合约收益
+        data = self.futures_data[symbol]
+        data['profit_usdt'], data['profit_percent'] = self.calculate_futures_profit(symbol, current_price)
+        data['price'] = current_price
+        data['change_24h'] = change_24h
+        self.data_version += 1
+    
+    def update_futures_totals(self) -> None:
+        """汇总合约总收益"""
+        total_futures_profit = sum(self.futures_data[symbol]['profit_usdt'] for symbol in self.held_futures)
+        self.total_futures_profit = total_futures_profit
+        self.total_futures_profit_percent = (total_futures_profit / self.total_futures_investment * 100) if self.total_futures_investment > 0 else 0
 
-            # 5分钟K线
-            klines_5m = self.client.get_klines(
-                symbol=symbol,
-                interval=Client.KLINE_INTERVAL_5MINUTE,
-                limit=2
-            )
-            if klines_5m:
-                open_price_5m = float(klines_5m[0][1])
-                current_price_5m = float(klines_5m[-1][4])
-                self.price_data[symbol]['change_5m'] = self.calculate_change_percent(
-                    current_price_5m, open_price_5m
-                )
-        except Exception:
-            pass
+    def print_error(self, message: str) -> None:
+        """从推送/轮询线程输出错误信息"""
+        # Live运行时console.print会在当前线程顺带重绘表格，持锁输出才不会读到界面线程改写了一半的单元格
+        with self.lock:
+            self.console.print(f"[red]{message}[/red]")
 
-    def update_price_data(self) -> None:
-        """更新价格数据"""
+    def fetch_spot_tickers(self) -> List[Dict]:
+        """获取监控中现货交易对的24h行情，遇到不存在的交易对时剔除后重试"""
         try:
-            # 记录本次更新的时间戳
-            update_time = datetime.now()
-            self.last_update_time = update_time.strftime('%H:%M:%S.%f')[:-4]
+            return self.client.get_public(self.spot_ticker_url)
+        except BinanceAPIException as e:
+            # symbols 参数中只要有一个交易对不存在，整个请求都会以 -1121 被拒绝
+            if e.code != -1121:
+                raise
+        
+        # 对照全市场最新价找出不存在的交易对，之后的请求不再包含它们
+        listed = {t['symbol'] for t in self.client.get_public(f"{self.client.API_URL}/v3/ticker/price")}
+        unknown = [symbol for symbol in self.active_spot if symbol not in listed]
+        if unknown:
+            self.active_spot = [symbol for symbol in self.active_spot if symbol in listed]
+            self.spot_ticker_url = self.build_spot_ticker_url()
+            self.print_error(f"以下交易对不存在，已停止获取行情: {', '.join(unknown)}")
+        else:
+            # 找不出是哪个交易对被拒绝时，改为请求全市场数据，由调用方按交易对过滤
+            self.spot_ticker_url = f"{self.client.API_URL}/v3/ticker/24hr"
+        
+        if not self.active_spot:
+            return []
+        return self.client.get_public(self.spot_ticker_url)
 
-            # 批量获取所有交易对的ticker数据
-            all_tickers = {t['symbol']: t for t in self.client.get_ticker()}
-            
-            # 更新每个交易对的数据
-            total_profit = 0
-            for symbol in self.price_data.keys():
-                if symbol in all_tickers:
-                    ticker = all_tickers[symbol]
-                    current_price = float(ticker['lastPrice'])
-                    
-                    # 检查价格提醒
-                    self.check_price_alerts(symbol, current_price)
-                    
-                    # 计算收益
-                    profit_usdt, profit_percent = self.calculate_profit(symbol, current_price)
-                    total_profit += profit_usdt
-                    
-                    self.price_data[symbol].update({
-                        'price': current_price,
-                        'change_24h': float(ticker['priceChangePercent']),
-                        'profit_usdt': profit_usdt,
-                        'profit_percent': profit_percent
-                    })
-                    # 同步更新K线数据
-                    self.get_klines_change(symbol)
+    def update_price_data(self) -> None:
+        """通过REST接口更新价格数据（启动快照及轮询模式使用）"""
+        # 需要刷新的K线请求先在线程池中发出，与下面的ticker请求同时进行
+        pending_klines = self.request_klines()
+        
+        try:
+            # 只获取监控中的交易对的ticker数据，而不是全市场
+            tickers = self.fetch_spot_tickers()
+            # 字符串转浮点在锁外一次做完（回退到全市场请求时只保留监控中的交易对）
+            updates = [
+                (ticker['symbol'], float(ticker['lastPrice']), float(ticker['priceChangePercent']))
+                for ticker in tickers
+                if ticker['symbol'] in self.price_data
+            ]
             
-            # 更新总收益率
-            self.total_profit = total_profit
-            self.total_profit_percent = (total_profit / self.total_investment * 100) if self.total_investment > 0 else 0
+            # 网络请求和解析在锁外完成，写入数据时才加锁
+            with self.lock:
+                # 记录本次更新的时间戳
+                self.last_update_time = self.format_timestamp(time.time_ns())
+                
+                for symbol, current_price, change_24h in updates:
+                    self.apply_spot_ticker(symbol, current_price, change_24h)
+                
+                # 更新总收益率
+                self.update_spot_totals()
             
         except Exception as e:
-            self.console.print(f"[red]获取数据时发生错误: {str(e)}[/red]")
+            self.print_error(f"获取数据时发生错误: {str(e)}")
+        
+        # 写入K线涨跌幅
+        self.apply_klines_change(pending_klines)
     
     def update_futures_data(self) -> None:
-        """更新合约数据"""
+        """通过REST接口更新合约数据（启动快照及轮询模式使用）"""
+        # 没有合约持仓时无需请求
+        if not self.held_futures:
+            return
+        
         try:
-            # 记录本次更新的时间戳
-            update_time = datetime.now()
-            self.last_futures_update_time = update_time.strftime('%H:%M:%S.%f')[:-4]
-
-            # 获取合约ticker数据
-            futures_tickers = self.client.futures_symbol_ticker()
-            futures_tickers_dict = {t['symbol']: t for t in futures_tickers}
-            
-            # 获取24h统计数据
+            # 24h统计数据已包含最新价，一次请求即可（全市场返回，只保留持仓中的交易对）
+            wanted = self.held_futures_set
             futures_24h = self.client.futures_ticker()
-            futures_24h_dict = {t['symbol']: t for t in futures_24h}
-            
-            # 更新每个合约交易对的数据
-            total_futures_profit = 0
-            for symbol in self.futures_data.keys():
-                if symbol in futures_tickers_dict and symbol in futures_24h_dict:
-                    current_price = float(futures_tickers_dict[symbol]['price'])
-                    change_24h = float(futures_24h_dict[symbol]['priceChangePercent'])
-                    
-                    # 计算合约收益
-                    profit_usdt, profit_percent, liquidation_price = self.calculate_futures_profit(symbol, current_price)
-                    total_futures_profit += profit_usdt
-                    
-                    self.futures_data[symbol].update({
-                        'price': current_price,
-                        'change_24h': change_24h,
-                        'profit_usdt': profit_usdt,
-                        'profit_percent': profit_percent,
-                        'liquidation_price': liquidation_price
-                    })
+            # 字符串转浮点在锁外一次做完
+            updates = [
+                (t['symbol'], float(t['lastPrice']), float(t['priceChangePercent']))
+                for t in futures_24h
+                if t['symbol'] in wanted and 'lastPrice' in t
+            ]
             
-            # 更新总收益率
-            self.total_futures_profit = total_futures_profit
-            self.total_futures_profit_percent = (total_futures_profit / self.total_futures_investment * 100) if self.total_futures_investment > 0 else 0
+            with self.lock:
+                # 记录本次更新的时间戳
+                self.last_futures_update_time = self.format_timestamp(time.time_ns())
+                
+                # 更新每个有持仓的合约交易对的数据
+                for symbol, current_price, change_24h in updates:
+                    self.apply_futures_ticker(symbol, current_price, change_24h)
+                
+                # 更新总收益率
+                self.update_futures_totals()
             
         except Exception as e:
-            self.console.print(f"[red]获取合约数据时发生错误: {str(e)}[/red]")
-
-    def get_sorted_symbols(self) -> List[str]:
-        """获取按价格排序的交易对列表"""
-        return sorted(
-            self.price_data.keys(),
-            key=lambda x: self.price_data[x]['price'],
-            reverse=True
-        )
+            self.print_error(f"获取合约数据时发生错误: {str(e)}")
+
+    def handle_stream_error(self, market: str, data: Dict) -> None:
+        """处理推送错误，连接已无法恢复时切换到REST轮询"""
+        with self.lock:
+            # 已切换到轮询时，忽略已关闭连接的后续错误
+            if not self.use_websocket:
+                return
+            fatal = data.get('type') in _STREAM_FATAL_ERRORS
+            if fatal:
+                # 底部信息随之改为轮询模式的说明
+                self.use_websocket = False
+                self.data_version += 1
+        
+        self.print_error(f"{market}行情推送错误: {data.get('m')}")
+        if fatal:
+            self.print_error(f"{market}行情推送连接已断开，改为REST轮询")
+            # 关闭连接要等待事件循环线程，不能在推送回调里直接进行
+            threading.Thread(target=self.fall_back_to_polling, daemon=True).start()
+    
+    def fall_back_to_polling(self) -> None:
+        """关闭WebSocket行情推送并启动REST轮询"""
+        self.stop_streams()
+        self.start_polling()
+    
+    def on_spot_message(self, msg: Dict) -> None:
+        """处理现货WebSocket推送（miniTicker及1m/5m K线）"""
+        # 回调中抛出的异常会结束python-binance的监听任务，单条消息出错不能影响后续推送
+        try:
+            self.handle_spot_message(msg)
+        except Exception as e:
+            self.print_error(f"处理现货行情推送时发生错误: {str(e)}")
+    
+    def handle_spot_message(self, msg: Dict) -> None:
+        """解析现货推送并写入行情数据"""
+        data = msg.get('data', msg)
+        if data.get('e') == 'error':
+            self.handle_stream_error("现货", data)
+            return
+        
+        symbol = data.get('s')
+        if symbol not in self.price_data:
+            return
+        
+        if data['e'] == '24hrMiniTicker':
+            # miniTicker不带涨跌幅字段，用24h开盘价计算，与REST接口的priceChangePercent一致
+            current_price = float(data['c'])
+            change_24h = calculate_change_percent(current_price, float(data['o']))
+            with self.lock:
+                self.last_update_time = self.format_timestamp(time.time_ns())
+                self.apply_spot_ticker(symbol, current_price, change_24h)
+                self.update_spot_totals()
+        elif data['e'] == 'kline':
+            # 当前K线的开盘价到最新价的涨跌幅
+            kline = data['k']
+            change = calculate_change_percent(float(kline['c']), float(kline['o']))
+            with self.lock:
+                self.price_data[symbol][f"change_{kline['i']}"] = change
+                self.data_version += 1
+    
+    def on_futures_message(self, msg: Dict) -> None:
+        """处理合约WebSocket推送"""
+        # 与现货推送相同，单条消息出错不能结束监听任务
+        try:
+            self.handle_futures_message(msg)
+        except Exception as e:
+            self.print_error(f"处理合约行情推送时发生错误: {str(e)}")
+    
+    def handle_futures_message(self, msg: Dict) -> None:
+        """解析合约推送并写入行情数据"""
+        data = msg.get('data', msg)
+        if data.get('e') == 'error':
+            self.handle_stream_error("合约", data)
+            return
+        
+        symbol = data.get('s')
+        if symbol not in self.futures_data or data['e'] != '24hrMiniTicker':
+            return
+        
+        current_price = float(data['c'])
+        change_24h = calculate_change_percent(current_price, float(data['o']))
+        with self.lock:
+            self.last_futures_update_time = self.format_timestamp(time.time_ns())
+            self.apply_futures_ticker(symbol, current_price, change_24h)
+            self.update_futures_totals()
+    
+    def start_streams(self) -> None:
+        """启动WebSocket行情推送，现货和合约各使用一条组合流连接"""
+        self.twm = ThreadedWebsocketManager(https_proxy=self.https_proxy)
+        self.twm.start()
+        
+        spot_streams = []
+        for symbol in self.active_spot:
+            pair = symbol.lower()
+            spot_streams += [f"{pair}@miniTicker", f"{pair}@kline_1m", f"{pair}@kline_5m"]
+        self.twm.start_multiplex_socket(callback=self.on_spot_message, streams=spot_streams)
+        
+        # 只订阅有持仓的合约
+        if self.held_futures:
+            futures_streams = [f"{symbol.lower()}@miniTicker" for symbol in self.held_futures]
+            self.twm.start_futures_multiplex_socket(callback=self.on_futures_message, streams=futures_streams)
+    
+    def stop_streams(self) -> None:
+        """关闭WebSocket行情推送"""
+        if self.twm is not None:
+            self.twm.stop()
+            self.twm = None
+    
+    def poll_loop(self) -> None:
+        """REST轮询线程：现货每秒更新，合约每2秒更新"""
+        # 按单调时钟排定下一次更新的截止时间，不受系统校时影响，也不会累积漂移；
+        # run() 启动前已取过一次快照，首次轮询从一个周期之后开始
+        now = time.monotonic()
+        next_spot = now + SPOT_POLL_INTERVAL
+        next_futures = now + FUTURES_POLL_INTERVAL
+        
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            
+            # 每秒更新现货数据
+            if now >= next_spot:
+                self.update_price_data()
+                next_spot += SPOT_POLL_INTERVAL
+            
+            # 每2秒更新合约数据
+            if now >= next_futures:
+                self.update_futures_data()
+                next_futures += FUTURES_POLL_INTERVAL
+            
+            # 睡到最近的截止时间；某次更新超时后，后续更新会立即补上
+            self.stop_event.wait(max(0, min(next_spot, next_futures) - time.monotonic()))
+    
+    def start_polling(self) -> None:
+        """启动后台REST轮询线程"""
+        self.stop_event.clear()
+        self.poll_thread = threading.Thread(target=self.poll_loop, daemon=True)
+        self.poll_thread.start()
+    
+    def stop_polling(self) -> None:
+        """停止后台REST轮询线程"""
+        self.stop_event.set()
+        if self.poll_thread is not None:
+            self.poll_thread.join(timeout=5)
+            self.poll_thread = None
+
+    @staticmethod
+    def sort_by_price(order: List[Dict]) -> List[Dict]:
+        """按价格降序原地调整上一帧的顺序（插入排序），顺序未变化时只需一轮比较"""
+        for i in range(1, len(order)):
+            data = order[i]
+            price = data['price']
+            j = i
+            # 价格相同时保持原有先后，避免行在相等价格间来回跳动
+            while j > 0 and order[j - 1]['price'] < price:
+                order[j] = order[j - 1]
+                j -= 1
+            order[j] = data
+        return order
+
+    def get_sorted_spot(self) -> List[Dict]:
+        """获取按价格排序的现货行数据"""
+        self.spot_order = self.sort_by_price(self.spot_order)
+        return self.spot_order
+
+    def get_sorted_futures(self) -> List[Dict]:
+        """获取按价格排序的合约行数据"""
+        self.futures_order = self.sort_by_price(self.futures_order)
+        return self.futures_order
 
     def format_price(self, price: float) -> str:
         """格式化价格显示"""
-        if price >= 1000:
-            return f"{price:,.2f}"
-        elif price >= 1:
-            return f"{price:.4f}"
-        else:
-            return f"{price:.8f}"
+        return _PRICE_FORMATTERS[bisect_right(_PRICE_THRESHOLDS, price)](price)
 
-    def format_change(self, change: float) -> str:
+    @staticmethod
+    def change_style(value: float) -> Style:
+        """根据涨跌选择颜色"""
+        return _SIGN_STYLES[(value > 0) - (value < 0)]
+
+    def format_change(self, change: float) -> Tuple[str, Style]:
         """格式化涨跌幅显示"""
-        if change > 0:
-            return f"[green]+{change:.2f}%[/green]"
-        elif change < 0:
-            return f"[red]{change:.2f}%[/red]"
-        return f"[white]{change:.2f}%[/white]"
+        sign = (change > 0) - (change < 0)
+        return _CHANGE_FORMATTERS[sign](change), _SIGN_STYLES[sign]
 
-    def format_profit(self, profit: float, percent: float) -> str:
+    def format_profit(self, profit: float, percent: float) -> Tuple[str, Style]:
         """格式化收益显示"""
-        if profit > 0:
-            return f"[green]+{profit:.2f}U ({percent:+.2f}%)[/green]"
-        elif profit < 0:
-            return f"[red]{profit:.2f}U ({percent:+.2f}%)[/red]"
-        return f"[white]{profit:.2f}U ({percent:+.2f}%)[/white]"
+        sign = (profit > 0) - (profit < 0)
+        return _PROFIT_FORMATTERS[sign](profit, percent), _SIGN_STYLES[sign]
 
-    def generate_table(self) -> Panel:
-        """生成价格表格"""
+    def format_current_price(self, price: float, change_24h: float) -> Tuple[str, Style]:
+        """格式化当前价格显示（按24h涨跌着色）"""
+        if price > 0:
+            return self.format_price(price), self.change_style(change_24h)
+        return "等待数据...", _STYLE_DIM
+
+    @staticmethod
+    def add_cell_rows(table: Table, count: int) -> Tuple[List[List[Text]], Text]:
+        """为表格建好数据行和总收益行，返回各数据行除排名外的单元格及总收益单元格"""
+        rows = []
+        for row in range(count):
+            # 排名列只与行号有关，建表时写好后不再改动
+            cells = [Text() for _ in range(len(table.columns) - 1)]
+            table.add_row(Text(f"#{row + 1}"), *cells)
+            rows.append(cells)
+        
+        total_cell = Text()
+        blanks = [Text() for _ in range(len(table.columns) - 3)]
+        table.add_row(Text(), Text("总计", style=_STYLE_BOLD), *blanks, total_cell)
+        return rows, total_cell
+
+    def build_spot_panel(self) -> Panel:
+        """构建现货表格骨架（启动时执行一次，之后只替换单元格内容）"""
         table = Table(
             show_header=True,
             header_style="bold magenta",
-            title=f"币安实时价格监控 (更新时间: {self.last_update_time})",
             title_style="bold cyan"
         )
         
@@ -504,49 +895,77 @@ class PriceMonitor:
         table.add_column("5m涨跌", justify="right", width=12)
         table.add_column("1m涨跌", justify="right", width=12)
         table.add_column("持仓收益", justify="right", width=25)
+        
+        # 每个交易对一行，外加总收益行
+        self.spot_cells, self.spot_total_cell = self.add_cell_rows(table, len(self.price_data))
+        
+        return Panel(
+            table,
+            border_style="green",
+            subtitle_align="center"
+        )
+    
+    def build_futures_panel(self) -> Panel:
+        """构建合约表格骨架（启动时执行一次，之后只替换单元格内容）"""
+        table = Table(
+            show_header=True,
+            header_style="bold magenta",
+            title_style="bold yellow"
+        )
+        
+        # 添加表格列
+        table.add_column("排名", style="blue", justify="center", width=6)
+        table.add_column("币种", style="cyan", justify="left", width=12)
+        table.add_column("开仓价格", style="white", justify="right", width=13)
+        table.add_column("当前价格", style="yellow", justify="right", width=13)
+        table.add_column("24h涨跌", justify="right", width=10)
+        table.add_column("杠杆", justify="center", width=6)
+        table.add_column("方向", justify="center", width=8)
+        table.add_column("爆仓价格", justify="right", width=13)
+        table.add_column("持仓收益", justify="right", width=22)
+        
+        # 只为有持仓的合约建行，外加总收益行
+        self.futures_cells, self.futures_total_cell = self.add_cell_rows(table, len(self.held_futures))
+        
+        return Panel(
+            table,
+            border_style="yellow",
+            subtitle_align="center"
+        )
+    
+    @staticmethod
+    def set_row(cells: List[Text], *values: Tuple[str, Style]) -> None:
+        """原地改写一行单元格的文本和颜色"""
+        for cell, (plain, style) in zip(cells, values):
+            cell.plain = plain
+            cell.style = style
 
-        # 获取排序后的交易对
-        sorted_symbols = self.get_sorted_symbols()
+    def generate_table(self) -> Panel:
+        """更新价格表格"""
+        table = self.spot_panel.renderable
+        table.title = f"币安实时价格监控 (更新时间: {self.last_update_time})"
+
+        # 获取排序后的行数据
+        sorted_spot = self.get_sorted_spot()
         
-        # 添加行数据
-        for rank, symbol in enumerate(sorted_symbols, 1):
-            data = self.price_data[symbol]
-            price = data['price']
-            
-            # 设置价格颜色
-            if data['change_24h'] > 0:
-                price_color = "green"
-            elif data['change_24h'] < 0:
-                price_color = "red"
-            else:
-                price_color = "white"
-            
-            price_str = f"[{price_color}]{self.format_price(price)}[/{price_color}]"
-            
-            table.add_row(
-                f"#{rank}",
-                f"{data['display_name']} ({symbol[:-4]})",
-                price_str if price > 0 else "[dim]等待数据...[/dim]",
+        # 写入行数据
+        for cells, data in zip(self.spot_cells, sorted_spot):
+            self.set_row(
+                cells,
+                (data['label'], ""),
+                self.format_current_price(data['price'], data['change_24h']),
                 self.format_change(data['change_24h']),
                 self.format_change(data['change_5m']),
                 self.format_change(data['change_1m']),
                 self.format_profit(data['profit_usdt'], data['profit_percent'])
             )
         
-        # 添加总收益行
-        table.add_row(
-            "",
-            "[bold]总计",
-            "",
-            "",
-            "",
-            "",
-            self.format_profit(self.total_profit, self.total_profit_percent)
-        )
+        # 写入总收益行
+        self.set_row([self.spot_total_cell], self.format_profit(self.total_profit, self.total_profit_percent))
         
         # 添加底部信息
         info_text = Text()
-        info_text.append("\n所有数据每秒更新 | ", style="dim green")
+        info_text.append("\n所有数据实时推送 | " if self.use_websocket else "\n所有数据每秒更新 | ", style="dim green")
         info_text.append("按价格降序排列 | ", style="dim yellow")
         info_text.append(f"总投资: {self.total_investment:.2f}U | ", style="dim cyan")
         
@@ -561,96 +980,43 @@ class PriceMonitor:
             info_text.append(f"总收益: {self.total_profit:.2f}U | ", style="bold white")
             info_text.append(f"收益率: {self.total_profit_percent:.2f}%", style="bold white")
         
-        return Panel(
-            table,
-            border_style="green",
-            subtitle=info_text,
-            subtitle_align="center"
-        )
+        self.spot_panel.subtitle = info_text
+        return self.spot_panel
     
     def generate_futures_table(self) -> Panel:
-        """生成合约价格表格"""
-        table = Table(
-            show_header=True,
-            header_style="bold magenta",
-            title=f"币安合约实时监控 (更新时间: {self.last_futures_update_time})",
-            title_style="bold yellow"
-        )
-        
-        # 添加表格列
-        table.add_column("排名", style="blue", justify="center", width=6)
-        table.add_column("币种", style="cyan", justify="left", width=12)
-        table.add_column("开仓价格", style="white", justify="right", width=13)
-        table.add_column("当前价格", style="yellow", justify="right", width=13)
-        table.add_column("24h涨跌", justify="right", width=10)
-        table.add_column("杠杆", justify="center", width=6)
-        table.add_column("方向", justify="center", width=8)
-        table.add_column("爆仓价格", justify="right", width=13)
-        table.add_column("持仓收益", justify="right", width=22)
+        """更新合约价格表格"""
+        table = self.futures_panel.renderable
+        table.title = f"币安合约实时监控 (更新时间: {self.last_futures_update_time})"
 
         # 获取按价格排序的合约交易对
-        sorted_futures = sorted(
-            self.futures_data.keys(),
-            key=lambda x: self.futures_data[x]['price'],
-            reverse=True
-        )
+        sorted_futures = self.get_sorted_futures()
         
-        # 添加行数据
-        for rank, symbol in enumerate(sorted_futures, 1):
-            data = self.futures_data[symbol]
-            price = data['price']
-            
-            # 只显示有持仓的合约
-            if data['buy_amount'] == 0:
-                continue
-            
-            # 设置价格颜色
-            if data['change_24h'] > 0:
-                price_color = "green"
-            elif data['change_24h'] < 0:
-                price_color = "red"
-            else:
-                price_color = "white"
-            
-            price_str = f"[{price_color}]{self.format_price(price)}[/{price_color}]"
-            
-            # 开仓价格显示
-            buy_price_str = f"[white]{self.format_price(data['buy_price'])}[/white]"
-            
+        # 写入行数据（排序列表中只有持仓合约）
+        for cells, data in zip(self.futures_cells, sorted_futures):
             # 方向显示
-            side_str = "[green]做多[/green]" if data['position_side'] == "LONG" else "[red]做空[/red]"
-            
-            # 爆仓价格显示
-            liquidation_str = f"[red]{self.format_price(data['liquidation_price'])}[/red]"
+            if data['position_side'] == "LONG":
+                side = ("做多", _STYLE_GREEN)
+            else:
+                side = ("做空", _STYLE_RED)
             
-            table.add_row(
-                f"#{rank}",
-                f"{symbol[:-4]}",
-                buy_price_str,
-                price_str if price > 0 else "[dim]等待数据...[/dim]",
+            self.set_row(
+                cells,
+                (data['label'], ""),
+                (self.format_price(data['buy_price']), _STYLE_WHITE),
+                self.format_current_price(data['price'], data['change_24h']),
                 self.format_change(data['change_24h']),
-                f"{data['leverage']}x",
-                side_str,
-                liquidation_str,
+                (f"{data['leverage']}x", ""),
+                side,
+                (self.format_price(data['liquidation_price']), _STYLE_RED),
                 self.format_profit(data['profit_usdt'], data['profit_percent'])
             )
         
-        # 添加总收益行
-        table.add_row(
-            "",
-            "[bold]总计",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            self.format_profit(self.total_futures_profit, self.total_futures_profit_percent)
-        )
+        # 写入总收益行
+        self.set_row([self.futures_total_cell], self.format_profit(self.total_futures_profit, self.total_futures_profit_percent))
         
         # 添加底部信息
         info_text = Text()
-        info_text.append("\n合约数据每2秒更新 | ", style="dim green")
+        info_text.append("\n合约数据实时推送 | " if self.use_websocket else "\n合约数据每2秒更新 | ", style="dim green")
         info_text.append("按价格降序排列 | ", style="dim yellow")
         info_text.append(f"总开仓金额(保证金): {self.total_futures_investment:.2f}U | ", style="dim cyan")
         
@@ -665,18 +1031,32 @@ class PriceMonitor:
             info_text.append(f"总收益: {self.total_futures_profit:.2f}U | ", style="bold white")
             info_text.append(f"收益率: {self.total_futures_profit_percent:.2f}%", style="bold white")
         
-        return Panel(
-            table,
-            border_style="yellow",
-            subtitle=info_text,
-            subtitle_align="center"
-        )
+        self.futures_panel.subtitle = info_text
+        return self.futures_panel
 
     def generate_combined_display(self) -> Group:
         """生成组合显示（现货+合约）"""
-        spot_panel = self.generate_table()
-        futures_panel = self.generate_futures_table()
-        return Group(spot_panel, futures_panel)
+        self.generate_table()
+        self.generate_futures_table()
+        return self.combined_display
+
+    def run_render_loop(self, live: Live) -> None:
+        """界面刷新循环：只负责以固定频率绘制，不做任何网络请求"""
+        rendered_version = None
+        next_frame = time.monotonic()
+        while True:
+            # 自上一帧以来没有新数据时跳过整个表格生成
+            display = None
+            with self.lock:
+                if self.data_version != rendered_version:
+                    display = self.generate_combined_display()
+                    rendered_version = self.data_version
+            # 只在表格内容变化后重绘一次；单元格只在本线程持锁改写，其他线程持锁输出，绘制时不会读到改了一半的表格
+            if display is not None:
+                live.update(display, refresh=True)
+            
+            next_frame += RENDER_INTERVAL
+            time.sleep(max(0, next_frame - time.monotonic()))
 
     def run(self):
         """运行监控程序"""
@@ -691,32 +1071,22 @@ class PriceMonitor:
             
             self.console.print("[yellow]正在获取合约初始数据...[/yellow]")
             self.update_futures_data()
-            self.console.print("[green]合约数据获取成功！开始实时监控...[/green]\n")
+            self.console.print("[green]合约数据获取成功！[/green]")
+            
+            if self.use_websocket:
+                self.console.print("[yellow]正在连接WebSocket行情推送...[/yellow]")
+                self.start_streams()
+            else:
+                self.start_polling()
+            self.console.print("[green]开始实时监控...[/green]\n")
             
-            # 合约更新计数器
-            futures_update_counter = 0
+            # 此时推送/轮询线程已在写入数据，首帧同样要在锁内生成
+            with self.lock:
+                display = self.generate_combined_display()
             
-            # 使用Rich Live显示实时更新的表格
-            with Live(self.generate_combined_display(), refresh_per_second=2, console=self.console) as live:
-                while True:
-                    start_time = time.time()
-                    
-                    # 每秒更新现货数据
-                    self.update_price_data()
-                    
-                    # 每2秒更新合约数据
-                    futures_update_counter += 1
-                    if futures_update_counter >= 2:
-                        self.update_futures_data()
-                        futures_update_counter = 0
-                    
-                    # 更新显示
-                    live.update(self.generate_combined_display())
-                    
-                    # 精确控制更新间隔为1秒
-                    elapsed = time.time() - start_time
-                    if elapsed < 1:
-                        time.sleep(1 - elapsed)
+            # 使用Rich Live显示实时更新的表格，关闭自动刷新，由刷新循环在数据变化时重绘
+            with Live(display, auto_refresh=False, console=self.console) as live:
+                self.run_render_loop(live)
         
         except KeyboardInterrupt:
             self.console.print("\n[yellow]正在停止监控...[/yellow]")
@@ -725,6 +1095,10 @@ class PriceMonitor:
             self.console.print(f"\n[red]发生错误: {str(e)}[/red]")
             import traceback
             traceback.print_exc()
+        finally:
+            self.stop_streams()
+            self.stop_polling()
+            self.executor.shutdown(wait=False)
 
 def main():
     """主函数"""